@@ -1,6 +1,9 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Optional, Type
 
+import requests
 from pydantic import Field
 from steamship import Block
 from steamship.agents.functional import FunctionsBasedAgent
@@ -24,6 +27,28 @@ from tools.video_message import VideoMessageTool
 TEMPERATURE = 0.7
 MAX_FREE_MESSAGES = 5
 
+# Search and video tools are only offered to the LLM when the user's message hints at them, so that small talk
+# does not pay for every function schema on each call. Triggers match whole words only ("pic" but not "topic" or
+# "picnic"). Selfies are the companion's core feature and are asked for in many indirect ways ("can I see you?",
+# "another one please"), and the system prompt tells the model to reference media blocks, so SelfieTool is always
+# offered rather than risking made-up Block references when no function is available.
+ALWAYS_ON_TOOLS = {"SelfieTool"}
+TOOL_TRIGGERS = {
+    "SearchTool": re.compile(
+        r"\b(?:search|google|look up|news|latest|weather|forecast|score|price)\b|https?://|www\."
+    ),
+    "VideoMessageTool": re.compile(r"\bvideos?\b"),
+}
+
+LEADING_NON_WORD = re.compile(r"^\W+")
+
+# Kept at module level so warm workers reuse their TCP/TLS connection to the Telegram Bot API across invocations.
+TELEGRAM_SESSION = requests.Session()
+# The typing indicator is cosmetic, so a slow Telegram API must not hold up the turn or the shared session.
+TELEGRAM_TIMEOUT_S = 2
+# Typing actions are sent from here so that they never add a Telegram round-trip to the start of a turn.
+TELEGRAM_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
 
 class GirlFriendGPTConfig(TelegramTransportConfig):
     elevenlabs_api_key: str = Field(
@@ -67,12 +92,38 @@ Only use the functions you have been provided with.
 """
 
 
+@lru_cache(maxsize=32)
+def build_system_prompt(name: str, byline: str, identity: str, behavior: str) -> str:
+    """Return the system prompt for a companion, formatted once per process for each companion."""
+    return SYSTEM_PROMPT.format(name=name, byline=byline, identity=identity, behavior=behavior)
+
+
+class TypingTelegramTransport(TelegramTransport):
+    """Telegram transport that shows a typing indicator while the companion composes its reply."""
+
+    def build_emit_func(self, chat_id: str) -> EmitFunc:
+        # Called by telegram_respond right before the agent runs, so the indicator covers LLM generation.
+        TELEGRAM_EXECUTOR.submit(self.send_typing_action, chat_id)
+        return super().build_emit_func(chat_id)
+
+    def send_typing_action(self, chat_id: str):
+        try:
+            TELEGRAM_SESSION.get(
+                f"{self.api_root}/sendChatAction",
+                params={"chat_id": chat_id, "action": "typing"},
+                timeout=TELEGRAM_TIMEOUT_S,
+            )
+        except requests.RequestException:
+            # The typing indicator is cosmetic; never fail the turn because of it.
+            pass
+
+
 class GirlfriendGPT(AgentService):
     """Deploy companions and connect them to Telegram."""
 
     config: GirlFriendGPTConfig
     USED_MIXIN_CLASSES = [
-        TelegramTransport,
+        TypingTelegramTransport,
         SteamshipWidgetTransport,
         IndexerPipelineMixin,
     ]
@@ -81,15 +132,16 @@ class GirlfriendGPT(AgentService):
         super().__init__(**kwargs)
 
         model_name = "gpt-4" if self.config.use_gpt4 else "gpt-3.5-turbo"
+        self._tools = [SearchTool(), SelfieTool(), VideoMessageTool(self.client)]
         self._agent = FunctionsBasedAgent(
-            tools=[SearchTool(), SelfieTool(), VideoMessageTool(self.client)],
+            tools=self._tools,
             llm=ChatOpenAI(self.client, model_name=model_name, temperature=TEMPERATURE),
         )
-        self._agent.PROMPT = SYSTEM_PROMPT.format(
-            name=self.config.name,
-            byline=self.config.byline,
-            identity=self.config.identity,
-            behavior=self.config.behavior,
+        self._agent.PROMPT = build_system_prompt(
+            self.config.name,
+            self.config.byline,
+            self.config.identity,
+            self.config.behavior,
         )
 
         # This Mixin provides HTTP endpoints that connects this agent to a web client
@@ -101,7 +153,7 @@ class GirlfriendGPT(AgentService):
 
         # This Mixin provides HTTP endpoints that connects this agent to Telegram
         self.add_mixin(
-            TelegramTransport(
+            TypingTelegramTransport(
                 client=self.client,
                 agent_service=self,
                 agent=self._agent,
@@ -118,30 +170,70 @@ class GirlfriendGPT(AgentService):
         # Note: EmitFunc is Callable[[List[Block], Metadata], None]
         def wrap_emit(emit_func: EmitFunc):
             def wrapper(blocks: List[Block], metadata: Metadata):
+                output_blocks = []
+                spoken_chunks = []
                 for block in blocks:
                     if block.is_text():
-                        text = re.sub(r"^\W+", "", block.text.strip())
+                        text = LEADING_NON_WORD.sub("", block.text.strip())
                         if text:
                             block.text = text
-                            emit_func([block], metadata)
-                            if speech:
-                                audio_block = speech.run([block], context)[0]
-                                audio_block.set_public_data(True)
-                                audio_block.url = audio_block.raw_data_url
-                                emit_func([audio_block], metadata)
+                            output_blocks.append(block)
+                            spoken_chunks.append(text)
                     else:
+                        output_blocks.append(block)
+
+                # All text of this emission is voiced with a single ElevenLabs request, which runs in the
+                # background while the text is emitted; the audio follows once it is ready.
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    speech_task = None
+                    if speech and spoken_chunks:
+                        speech_text = "\n".join(spoken_chunks)
+                        speech_task = executor.submit(
+                            self.generate_speech, speech, speech_text, context
+                        )
+
+                    for block in output_blocks:
                         emit_func([block], metadata)
 
+                    if speech_task:
+                        emit_func([speech_task.result()], metadata)
+
+            wrapper.is_speech_wrapped = True
             return wrapper
 
-        context.emit_funcs = [wrap_emit(emit_func) for emit_func in context.emit_funcs]
+        # A context that is run again (e.g. on a retry) already carries wrapped emit functions; wrapping them
+        # twice would voice every reply twice.
+        context.emit_funcs = [
+            emit_func if getattr(emit_func, "is_speech_wrapped", False) else wrap_emit(emit_func)
+            for emit_func in context.emit_funcs
+        ]
+        agent.tools = self.select_tools(context)
         super().run_agent(agent, context)
 
+    def select_tools(self, context: AgentContext) -> List[Tool]:
+        """Return the always-on tools plus those relevant to the last user message."""
+        last_message = context.chat_history.last_user_message
+        text = (last_message.text if last_message else None) or ""
+        text = text.lower()
+        return [
+            tool
+            for tool in self._tools
+            if tool.name in ALWAYS_ON_TOOLS
+            or (tool.name in TOOL_TRIGGERS and TOOL_TRIGGERS[tool.name].search(text))
+        ]
+
     @classmethod
     def config_cls(cls) -> Type[Config]:
         """Return the Configuration class."""
         return GirlFriendGPTConfig
 
+    def generate_speech(self, speech: Tool, text: str, context: AgentContext) -> Block:
+        """Return a public audio block with text spoken by the speech tool."""
+        audio_block = speech.run([Block(text=text)], context)[0]
+        audio_block.set_public_data(True)
+        audio_block.url = audio_block.raw_data_url
+        return audio_block
+
     def voice_tool(self) -> Optional[Tool]:
         """Return tool to generate spoken version of output text."""
         speech = GenerateSpeechTool()
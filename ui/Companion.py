@@ -2,11 +2,10 @@ import sys
 from pathlib import Path
 
 import streamlit as st
-from steamship.cli.create_instance import load_manifest
 
 sys.path.append(str((Path(__file__) / "..").resolve()))
 st.set_page_config(page_title="🎥->🤗 Youtube to Companion")
-from utils.data import get_companions, get_companion_attributes, add_resource
+from utils.data import get_companions, get_companion_attributes, add_resource_in_background
 from utils.utils import get_instance, to_snake
 from utils.ux import sidebar, get_api_key, show_response
 
@@ -16,8 +15,6 @@ st.write("Create your AI companion and chat about your favorite youtube video's"
 
 sidebar()
 
-manifest = load_manifest()
-
 if not st.session_state.get("instance"):
 
     # TODO: Add dropdown with examples
@@ -32,41 +29,45 @@ if not st.session_state.get("instance"):
     else:
         companion = {}
 
-    personality = st.text_input(
-        "Name",
-        value=companion.get("name", ""),
-        placeholder="The name of your companion",
-    )
-    byline = st.text_input(
-        "Byline",
-        value=companion.get("byline", ""),
-        placeholder="The byline of your companion",
-    )
-    identity = st.text_input(
-        "Identity",
-        value=companion.get("identity", ""),
-        placeholder="The identity of your companion",
-    )
-    behavior = st.text_input(
-        "Behavior",
-        value=companion.get("behavior", ""),
-        placeholder="The behavior of your companion",
-    )
-    st.session_state.companion_profile_img = st.text_input(
-        "Profile picture",
-        value=companion.get("profile_image", ""),
-        placeholder="The profile picture of your companion",
-    )
+    # Collect the profile in a form so typing in the fields does not rerun the whole page on every keystroke.
+    with st.form("companion_form"):
+        personality = st.text_input(
+            "Name",
+            value=companion.get("name", ""),
+            placeholder="The name of your companion",
+        )
+        byline = st.text_input(
+            "Byline",
+            value=companion.get("byline", ""),
+            placeholder="The byline of your companion",
+        )
+        identity = st.text_input(
+            "Identity",
+            value=companion.get("identity", ""),
+            placeholder="The identity of your companion",
+        )
+        behavior = st.text_input(
+            "Behavior",
+            value=companion.get("behavior", ""),
+            placeholder="The behavior of your companion",
+        )
+        st.session_state.companion_profile_img = st.text_input(
+            "Profile picture",
+            value=companion.get("profile_image", ""),
+            placeholder="The profile picture of your companion",
+        )
 
-    st.session_state.companion_first_message = st.text_input(
-        label="First message",
-        placeholder="The first message your companion sends when a new conversation starts.",
-    )
+        st.session_state.companion_first_message = st.text_input(
+            label="First message",
+            placeholder="The first message your companion sends when a new conversation starts.",
+        )
+
+        st.subheader("Long term memory")
+        youtube_video_url = st.text_input("Youtube Video URL")
 
-    st.subheader("Long term memory")
-    youtube_video_url = st.text_input("Youtube Video URL")
+        submitted = st.form_submit_button("🤗 Spin up your companion")
 
-    if st.button("🤗 Spin up your companion"):
+    if submitted:
 
         st.session_state.instance = instance = get_instance(
             to_snake(personality),
@@ -79,12 +80,11 @@ if not st.session_state.get("instance"):
         )
 
         if youtube_video_url:
-            with st.spinner("Companion is watching the video 👀..."):
-                add_resource(
-                    instance.invocation_url,
-                    str(instance.client.config.api_key),
-                    youtube_video_url,
-                )
+            st.session_state.ingest_future = add_resource_in_background(
+                instance.invocation_url,
+                str(instance.client.config.api_key),
+                youtube_video_url,
+            )
 
         st.balloons()
         st.experimental_rerun()
@@ -95,10 +95,24 @@ else:
 
     if st.button("+ New bot"):
         st.session_state.instance = None
+        st.session_state.ingest_future = None
         st.experimental_rerun()
 
     st.header(f"Start chatting with {companion_name}")
 
+    if ingest_future := st.session_state.get("ingest_future"):
+        if not ingest_future.done():
+            st.info("Sending the video to your companion 👀...")
+        else:
+            st.session_state.ingest_future = None
+            try:
+                ingest_future.result()
+                st.success(
+                    "Your companion will watch the video 🍿 Check the Manage page to see when it is indexed."
+                )
+            except Exception as e:
+                st.error(f"Loading the video generated an exception: {e}")
+
     if "messages" not in st.session_state:
         st.session_state["messages"] = [
             {"role": "assistant", "content": st.session_state.companion_first_message or "Hi ☺️"}
@@ -1,7 +1,7 @@
 import concurrent
 import itertools
 import json
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -11,14 +11,29 @@ import streamlit as st
 from steamship import PackageInstance
 
 
-def add_resource(invocation_url: str, api_key: str, url: str):
-
-    response = requests.post(
+def _post_index_url(invocation_url: str, api_key: str, url: str) -> requests.Response:
+    return requests.post(
         f"{invocation_url}index_url",
         json={"url": url},
         headers={"Authorization": f"bearer {api_key}"},
     )
-    return response.text
+
+
+def add_resource(invocation_url: str, api_key: str, url: str):
+    return _post_index_url(invocation_url, api_key, url).text
+
+
+def _queue_resource(invocation_url: str, api_key: str, url: str):
+    _post_index_url(invocation_url, api_key, url).raise_for_status()
+
+
+# Queueing the video runs here so the Streamlit session stays interactive meanwhile.
+INGEST_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def add_resource_in_background(invocation_url: str, api_key: str, url: str) -> Future:
+    """Queue url for indexing. The future resolves once the import is scheduled, not when it is indexed."""
+    return INGEST_POOL.submit(_queue_resource, invocation_url, api_key, url)
 
 
 def index_youtube_channel(
@@ -68,6 +83,7 @@ COMPANION_DIR = (
 ).resolve()
 
 
+@st.cache_data(ttl=3600)
 def get_companions():
     return [
         companion.stem
@@ -76,6 +92,7 @@ def get_companions():
     ]
 
 
+@st.cache_data(ttl=3600)
 def get_companion_attributes(companion_name: str):
     companion = json.load((COMPANION_DIR / f"{companion_name}.json").open())
     return {
@@ -0,0 +1,53 @@
+import functools
+import json
+import re
+from typing import Any, Dict
+
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from steamship import PackageInstance, Steamship
+from steamship.cli.create_instance import load_manifest
+from urllib3.util import Retry
+
+# One connection pool shared by every Steamship client the UI creates, so chat prompts reuse warm
+# TCP/TLS connections. Connection failures are retried for every request; 502/503 responses only for
+# idempotent methods, since re-sending a POST like "prompt" would run the agent turn twice.
+HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503]),
+)
+
+
+@st.cache_resource
+def get_manifest():
+    return load_manifest()
+
+
+@functools.lru_cache(maxsize=1024)
+def to_snake(text: str) -> str:
+    return "_".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def get_instance(name: str, config: Dict[str, Any]) -> PackageInstance:
+    # Spinning up the same companion twice returns the existing instance instead of re-provisioning it. The
+    # cache is shared by all sessions, so it is keyed on the API key the instance's client is created with, and
+    # bounded so that it neither holds every user's authenticated client forever nor serves deleted instances
+    # for long.
+    return _get_instance(
+        st.session_state.steamship_api_key, name, json.dumps(config, sort_keys=True)
+    )
+
+
+@st.cache_resource(ttl=3600, max_entries=64)
+def _get_instance(api_key: str, name: str, config_json: str) -> PackageInstance:
+    manifest = get_manifest()
+    client = Steamship(api_key=api_key, workspace=name)
+    client._session.mount("https://", HTTP_ADAPTER)
+
+    return client.use(
+        package_handle=manifest.handle,
+        instance_handle=name,
+        config=json.loads(config_json),
+        version=manifest.version,
+    )